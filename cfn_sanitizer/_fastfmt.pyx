@@ -0,0 +1,107 @@
+# cython: language_level=3
+"""
+Compiled versions of organize_template and format_yaml_output from utils.py.
+
+Built only when Cython is available at install time; utils.py falls back to
+its pure-Python implementations (_py_organize_template, _py_format_yaml_output)
+otherwise. Both must behave exactly like the originals, so keep them in sync;
+tests/test_fastfmt.py compares the two.
+"""
+import io
+
+# utils.py imports this module after defining these, so the partial import is safe
+from cfn_sanitizer.utils import (
+    CFN_SECTION_ORDER,
+    RESOURCE_PROPERTY_ORDER,
+    TOP_LEVEL_SECTIONS,
+    SPACED_SECTIONS,
+)
+
+
+cpdef dict organize_template(dict template):
+    """
+    Reorganize template sections and resource properties in the correct order
+    """
+    cdef dict ordered_template
+    cdef dict resources
+    cdef dict res_content
+    cdef object description
+
+    # Clean up the Description if present; most need no changes, so look before rewriting
+    description = template.get('Description')
+    if isinstance(description, str) and ('\u2011' in description or '\\n' in description):
+        # Ensure description doesn't have special Unicode characters or explicit newlines
+        description = description.replace('\u2011', '-')  # Replace Unicode hyphens
+        description = description.replace('\\n', '\n')    # Replace escaped newlines with actual ones
+        template['Description'] = description
+
+    # Sections in CFN_SECTION_ORDER first, then any other sections in their original order
+    ordered_template = {section: template[section] for section in CFN_SECTION_ORDER if section in template}
+    ordered_template.update(template)
+
+    # Order each resource as Type, Properties, then the remaining attributes
+    if 'Resources' in ordered_template:
+        resources = {}
+        for res_name, res_content in ordered_template['Resources'].items():
+            ordered_res = {prop: res_content[prop] for prop in RESOURCE_PROPERTY_ORDER if prop in res_content}
+            ordered_res.update(res_content)
+            resources[res_name] = ordered_res
+        ordered_template['Resources'] = resources
+
+    return ordered_template
+
+
+cpdef str format_yaml_output(object yaml_str):
+    """
+    Format CloudFormation YAML with proper spacing and structure.
+
+    `yaml_str` is either the YAML text or a text stream positioned at its start.
+    """
+    cdef object lines = io.StringIO(yaml_str) if isinstance(yaml_str, str) else yaml_str
+    cdef list output = []
+    cdef str line
+    cdef str last_line = ''
+    cdef str section
+    cdef str colon
+    cdef object current_section = None
+    cdef Py_ssize_t parameter_count = 0
+    cdef Py_ssize_t indent
+    cdef Py_UCS4 ch
+
+    for line in lines:
+        # Drop existing blank lines; spacing is decided below
+        if not line or line.isspace():
+            continue
+
+        # Handle top-level sections; only unindented lines can be one
+        ch = line[0]
+        if not ch.isspace():
+            section, colon, _ = line.partition(':')
+            if colon and section in TOP_LEVEL_SECTIONS:
+                # Add blank line before top-level sections (except first)
+                if output:
+                    output.append('\n')
+                current_section = section
+                parameter_count = 0
+        else:
+            # Handle level 2 items (parameters, resources); deeper lines are copied as they are.
+            # Counting stops past 2, since only an indent of exactly 2 matters.
+            indent = 0
+            for ch in line:
+                if not ch.isspace() or indent > 2:
+                    break
+                indent += 1
+            if indent == 2 and ':' in line:
+                if parameter_count > 0 and current_section in SPACED_SECTIONS:
+                    # Add blank line between parameters/resources
+                    output.append('\n')
+                parameter_count += 1
+
+        output.append(line)
+        last_line = line
+
+    # Every dumped line already ends in '\n'; only the last line of a plain string
+    # (or an empty document) can be missing it
+    if not last_line.endswith('\n'):
+        output.append('\n')
+    return ''.join(output)
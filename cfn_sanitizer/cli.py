@@ -10,11 +10,13 @@ from cfn_sanitizer.utils import save_template, save_report
               help='Path to write sanitized template')
 @click.option('-r', '--report',  'report_path', default=None,
               help='Optional JSON path to write replacement report')
-def main(input_path, output_path, report_path):
+@click.option('--pretty/--no-pretty', default=True,
+              help='Add blank lines between YAML sections and entries (default: on)')
+def main(input_path, output_path, report_path, pretty):
     """Sanitize a CloudFormation template by replacing hardcoded secrets."""
     template, fmt = load_template(input_path)
     sanitized, report = sanitize_template(template)
-    save_template(output_path, sanitized, fmt)
+    save_template(output_path, sanitized, fmt, pretty=pretty)
     if report_path:
         save_report(report_path, report)
     click.echo(f"Sanitized template: {output_path}")
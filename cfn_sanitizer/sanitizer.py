@@ -1,27 +1,482 @@
 import re
-import yaml
+import sys
+import string
+import json
+from functools import lru_cache
 from importlib import resources
 from typing import Dict, List, Any, Tuple, Union, Set
 
-# Load patterns.yaml via importlib.resources
-with resources.open_text('cfn_sanitizer', 'patterns.yaml') as f:
-    PATTERNS = yaml.safe_load(f)['patterns']
+# Optional linear-time regex engine (pip install cfn-sanitizer[fast])
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Optional SIMD multi-pattern scanner (pip install cfn-sanitizer[fast])
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Optional Aho-Corasick automaton for parameter-name keywords (pip install cfn-sanitizer[fast])
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Load patterns via importlib.resources. patterns.json is generated from
+# patterns.yaml at build time, since JSON parses far faster than YAML at import.
+with resources.open_text('cfn_sanitizer', 'patterns.json') as f:
+    PATTERNS = json.load(f)['patterns']
+
+# RE2 classes such as \w and \s are ASCII-only while re's are Unicode-aware, so
+# regexes using them stay on re to keep matching identical across engines
+_UNICODE_CLASS_RE = re.compile(r'\\[wWdDsSbB]')
+
+class _RE2Regex:
+    """
+    An RE2-compiled regex paired with its stdlib re twin. RE2 matches UTF-8, so
+    strings it can't encode (lone surrogates, e.g. from a "\\ud800" escape in a
+    JSON template) are matched with the re twin instead of raising.
+    """
+    __slots__ = ('pattern', '_re2', '_re')
+    
+    def __init__(self, compiled, regex: str):
+        self.pattern = regex
+        self._re2 = compiled
+        self._re = re.compile(regex)
+    
+    def search(self, text: str):
+        try:
+            return self._re2.search(text)
+        except UnicodeEncodeError:
+            return self._re.search(text)
+    
+    def finditer(self, text: str):
+        # RE2 only encodes the text once iteration starts, so collect the matches here
+        try:
+            return iter(list(self._re2.finditer(text)))
+        except UnicodeEncodeError:
+            return self._re.finditer(text)
+
+def _compile(regex: str):
+    """
+    Compile a regex with RE2 when it is installed and supports the syntax, which
+    guarantees linear-time matching (no catastrophic backtracking). Falls back to
+    the stdlib re module, e.g. for lookaheads or Unicode-aware classes.
+    """
+    if re2 is not None and not _UNICODE_CLASS_RE.search(regex):
+        options = re2.Options()
+        options.log_errors = False  # Unsupported syntax is expected; don't spam stderr
+        try:
+            return _RE2Regex(re2.compile(regex, options), regex)
+        except re2.error:
+            pass
+    return re.compile(regex)
+
+# Pre-compile pattern regexes once, in patterns.yaml order, so traversal
+# doesn't re-resolve pattern strings through the re cache on every node
+COMPILED_PATTERNS = [
+    (pattern_name, _compile(pattern_def['regex']))
+    for pattern_name, pattern_def in PATTERNS.items()
+    if 'regex' in pattern_def
+]
+PATTERN_REGEXES = dict(COMPILED_PATTERNS)
+
+# Union group name for each pattern, mapped to its COMPILED_PATTERNS index. Names are
+# generated, since pattern names in patterns.yaml need not be valid group names.
+PATTERN_POSITIONS = {f"p{idx}": idx for idx in range(len(COMPILED_PATTERNS))}
+
+# An unescaped numbered backreference (\1 to \9), which would refer to another
+# pattern's group once the regexes are combined
+_BACKREFERENCE_RE = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]')
+
+def _build_union_regex():
+    """
+    Fuse all pattern regexes into one alternation, one named group per pattern,
+    so a value is scanned in a single pass. Returns None when the patterns can't
+    be combined (e.g. numbered backreferences, inline global flags such as (?i)
+    or clashing group names); _match_pattern then tries each regex in turn.
+    """
+    if not COMPILED_PATTERNS or any(
+        _BACKREFERENCE_RE.search(regex.pattern) for _, regex in COMPILED_PATTERNS
+    ):
+        return None
+    try:
+        return _compile('|'.join(
+            f"(?P<{group}>{COMPILED_PATTERNS[idx][1].pattern})"
+            for group, idx in PATTERN_POSITIONS.items()
+        ))
+    except re.error:
+        return None
+
+UNION_RE = _build_union_regex()
+
+# Cheap literal screen run before any regex. A value can only match a pattern if it
+# contains one of the pattern's `prefilter` tokens (case-sensitive) or, for patterns
+# without tokens, is at least `min_length` long. Most strings in a template pass
+# neither test, so they never reach the regex engine.
+_REGEX_PATTERN_DEFS = [PATTERNS[pattern_name] for pattern_name, _ in COMPILED_PATTERNS]
+PREFILTER_TOKENS = tuple(
+    token for pattern_def in _REGEX_PATTERN_DEFS
+    for token in pattern_def.get('prefilter', []) if len(token) > 1
+)
+PREFILTER_CHARS = frozenset(
+    token for pattern_def in _REGEX_PATTERN_DEFS
+    for token in pattern_def.get('prefilter', []) if len(token) == 1
+)
+PREFILTER_MIN_LENGTH = min(
+    (pattern_def.get('min_length', 0) for pattern_def in _REGEX_PATTERN_DEFS
+     if 'prefilter' not in pattern_def),
+    default=sys.maxsize
+)
+
+def _may_match(value: str) -> bool:
+    """Return False when no pattern regex can possibly match the value."""
+    return (
+        len(value) >= PREFILTER_MIN_LENGTH
+        or not PREFILTER_CHARS.isdisjoint(value)
+        or any(token in value for token in PREFILTER_TOKENS)
+    )
+
+def _build_hyperscan_db():
+    """
+    Compile all pattern regexes into a single Hyperscan database, or return None
+    if Hyperscan is unavailable or rejects a pattern. Patterns are compiled in
+    prefilter mode, so a Hyperscan hit is only a candidate that still has to be
+    confirmed with the exact regex (this also covers lookaheads).
+    """
+    if hyperscan is None or not COMPILED_PATTERNS:
+        return None
+    flags = (hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH |
+             hyperscan.HS_FLAG_ALLOWEMPTY | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[regex.pattern.encode('utf-8') for _, regex in COMPILED_PATTERNS],
+            ids=list(range(len(COMPILED_PATTERNS))),
+            elements=len(COMPILED_PATTERNS),
+            flags=[flags] * len(COMPILED_PATTERNS),
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+HYPERSCAN_DB = _build_hyperscan_db()
+
+def _hyperscan_candidates(value: str) -> Union[List[int], None]:
+    """
+    Return the sorted COMPILED_PATTERNS indexes Hyperscan flags for the value,
+    or None when the value can't be scanned (e.g. lone surrogates).
+    """
+    try:
+        data = value.encode('utf-8')
+    except UnicodeEncodeError:
+        return None
+    hits = []
+    HYPERSCAN_DB.scan(data, match_event_handler=lambda pattern_id, *_: hits.append(pattern_id))
+    return sorted(hits)
+
+def _match_pattern(value: str) -> Union[str, None]:
+    """
+    Return the name of the first pattern (in patterns.yaml order) whose regex
+    matches anywhere in the value, or None if no pattern matches.
+    """
+    if not _may_match(value):
+        return None
+    
+    if HYPERSCAN_DB is not None:
+        candidates = _hyperscan_candidates(value)
+        if candidates is not None:
+            for idx in candidates:
+                pattern_name, regex = COMPILED_PATTERNS[idx]
+                if regex.search(value):
+                    return pattern_name
+            return None
+    
+    if UNION_RE is None:
+        for pattern_name, regex in COMPILED_PATTERNS:
+            if regex.search(value):
+                return pattern_name
+        return None
+    
+    match = UNION_RE.search(value)
+    if not match:
+        return None
+    # The union reports the leftmost hit; an earlier pattern may still match further right
+    position = PATTERN_POSITIONS[match.lastgroup]
+    for pattern_name, regex in COMPILED_PATTERNS[:position]:
+        if regex.search(value):
+            return pattern_name
+    return COMPILED_PATTERNS[position][0]
 
 # Keys that should be specifically scanned for sensitive content in string values
-STRING_SCAN_KEYS = {'Description', 'Name', 'Value'}
+STRING_SCAN_KEYS = frozenset({'Description', 'Name', 'Value'})
+
+# Free-text keys where only the credential portion of a general_credentials hit is replaced
+CREDENTIAL_TEXT_KEYS = frozenset({'Description', 'Name'})
+
+# Known list-type sensitive fields
+SENSITIVE_LIST_KEYS = frozenset({'Passwords'})
+
+def _build_key_index() -> Dict[str, str]:
+    """Map each property key to the first pattern that lists it under `keys`."""
+    index = {}
+    for pattern_name, pattern_def in PATTERNS.items():
+        for pattern_key in pattern_def.get('keys', []):
+            index.setdefault(pattern_key, pattern_name)
+    return index
+
+def _string_scan_patterns(key: str) -> List[Tuple[str, Any]]:
+    """
+    Regex patterns to try against values of `key`, in patterns.yaml order.
+    Stops at the key's own key-based pattern, since that match always returns.
+    """
+    scan = []
+    for pattern_name in PATTERNS:
+        if pattern_name == KEY_TO_PATTERN.get(key):
+            break
+        if pattern_name in PATTERN_REGEXES:
+            scan.append((pattern_name, PATTERN_REGEXES[pattern_name]))
+    return scan
+
+# Inverted indexes so property scanning is a dict lookup instead of a loop over PATTERNS
+KEY_TO_PATTERN = _build_key_index()
+STRING_SCAN_PATTERNS = {key: _string_scan_patterns(key) for key in STRING_SCAN_KEYS}
+
+# Patterns owning the nested fields handled outside the generic key lookup (None if no pattern lists them)
+USERDATA_PATTERN = KEY_TO_PATTERN.get('UserData')
+LOGIN_PASSWORD_PATTERN = KEY_TO_PATTERN.get('Password')
+
+# Every property key a secretsmanager placeholder can be written for
+PLACEHOLDER_KEYS = frozenset(KEY_TO_PATTERN) | STRING_SCAN_KEYS | {'UserData', 'Password'}
+
+# Pattern used for UserData scripts and list items no specific pattern matched
+FALLBACK_PATTERN = 'generic_secret'
+
+# Replacement strings, built once instead of formatted on every hit
+PLACEHOLDER_PATTERNS = dict.fromkeys([*PATTERNS, FALLBACK_PATTERN])
+PLACEHOLDERS = {
+    pattern_name: {
+        key: f"{{{{resolve:secretsmanager:{pattern_name}:SecretString:{key}}}}}"
+        for key in PLACEHOLDER_KEYS
+    }
+    for pattern_name in PLACEHOLDER_PATTERNS
+}
+VALUE_PLACEHOLDERS = {
+    pattern_name: f"SANITIZED-{pattern_name.upper()}-VALUE" for pattern_name in PLACEHOLDER_PATTERNS
+}
 
 # Common parameter names that likely contain sensitive data
-SENSITIVE_PARAM_NAMES = {
+SENSITIVE_PARAM_NAMES = frozenset({
     'password', 'secret', 'key', 'token', 'apikey', 'accesskey', 'privatekey', 
     'pwd', 'credential', 'auth', 'passwd'
-}
+})
 
 # Parameters names that should NOT be considered sensitive even if matched by other rules
-NON_SENSITIVE_PARAM_KEYWORDS = {
+NON_SENSITIVE_PARAM_KEYWORDS = frozenset({
     'type', 'instance', 'size', 'region', 'az', 'availability', 'zone',
     'count', 'number', 'name', 'env', 'environment', 'stage', 'class'
+})
+
+# Strong non-sensitive indicators that should override sensitivity checks
+STRONG_NON_SENSITIVE_TERMS = frozenset({
+    'bucket', 'domain', 'path', 'url', 'endpoint', 'address',
+    'name', 'file', 'region', 'zone', 'id', 'arn', 'identifier'
+})
+
+# Every parameter-name keyword tagged with its category. Where a term is in several
+# sets the strongest category wins, matching the order the checks are applied in.
+PARAM_TERM_CATEGORIES = {
+    **{term: 'sensitive' for term in SENSITIVE_PARAM_NAMES},
+    **{term: 'non_sensitive' for term in NON_SENSITIVE_PARAM_KEYWORDS},
+    **{term: 'strong_non_sensitive' for term in STRONG_NON_SENSITIVE_TERMS},
 }
 
+def _build_param_term_automaton():
+    """Build an Aho-Corasick automaton over PARAM_TERM_CATEGORIES, or None."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for term, category in PARAM_TERM_CATEGORIES.items():
+        automaton.add_word(term, category)
+    automaton.make_automaton()
+    return automaton
+
+PARAM_TERM_AUTOMATON = _build_param_term_automaton()
+
+def _param_term_categories(param_lower: str) -> Set[str]:
+    """
+    Return the categories of all keyword terms found in a lower-cased parameter
+    name: one linear pass with Aho-Corasick when available, else a substring scan.
+    """
+    if PARAM_TERM_AUTOMATON is not None:
+        return {category for _, category in PARAM_TERM_AUTOMATON.iter(param_lower)}
+    return {category for term, category in PARAM_TERM_CATEGORIES.items() if term in param_lower}
+
+# Any sensitive term appearing as a standalone word
+SENSITIVE_WORD_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(term) for term in sorted(SENSITIVE_PARAM_NAMES)) + r')\b'
+)
+
+# Instance type formats (e.g. t3.micro, db.r5.large), which are never sensitive
+INSTANCE_TYPE_RE = re.compile(r'^[a-z]+\d+\.(?:micro|small|medium|large|[0-9]?xl|metal)')
+DB_INSTANCE_TYPE_RE = re.compile(r'^db\.[a-z]+\d+\.(?:micro|small|medium|large|[0-9]?xl|metal)')
+
+# Template sections that get dedicated handling, resolved once per top-level key
+SECTION_PARAMETERS, SECTION_RESOURCES, SECTION_OTHER = 0, 1, 2
+TEMPLATE_SECTIONS = {'Parameters': SECTION_PARAMETERS, 'Resources': SECTION_RESOURCES}
+
+# Intrinsic functions whose arguments are logical IDs and attribute names, never literal
+# secrets; {'Ref': ...}-style nodes are not descended into while their argument is plain
+# scalars. Others such as Fn::FindInMap can nest Fn::Sub variable maps, so are walked.
+SKIP_INTRINSICS = frozenset({'Ref', 'Fn::GetAtt'})
+
+# Path length from which a dict can be an intrinsic call. The template sits at 0, each
+# section's map of logical IDs/parameter names at 1 and their bodies at 2, so a parameter,
+# resource or output named 'Ref' is never mistaken for one; property values start at 3
+INTRINSIC_MIN_DEPTH = 3
+
+def _is_scalar_args(args: Any) -> bool:
+    """Check if intrinsic arguments are a scalar or a list of scalars, with nothing to visit."""
+    if isinstance(args, list):
+        return not any(isinstance(arg, (dict, list)) for arg in args)
+    return not isinstance(args, dict)
+
+# Characters allowed in simple resource/instance names
+SIMPLE_NAME_CHARS = frozenset(string.ascii_letters + string.digits + '-')
+
+# Common password shape: upper case, digit and special character in either order.
+# Every value it flags contains one of PASSWORD_SPECIAL_CHARS.
+PASSWORD_HEURISTIC_RE = re.compile(r'[A-Z].*[0-9].*[!@#$%^&*()]|[0-9].*[A-Z].*[!@#$%^&*()]')
+PASSWORD_SPECIAL_CHARS = frozenset('!@#$%^&*()')
+
+def _is_simple_name(value: str) -> bool:
+    """
+    Check if a value is a simple name made only of ASCII letters, digits and dashes.
+    Set containment stays in C; like the regex it replaces (^[A-Za-z0-9-]+$),
+    a single trailing newline is tolerated.
+    """
+    if value.endswith('\n'):
+        value = value[:-1]
+    return bool(value) and SIMPLE_NAME_CHARS.issuperset(value)
+
+# End of the whitespace-delimited token a credential belongs to
+TOKEN_END_RE = re.compile(r'\s')
+
+# Quotes a credential may be wrapped in, masked up to the matching closing quote
+CREDENTIAL_QUOTES = frozenset('"\'')
+
+# Separator characters that mark what follows the keyword as its value; after bare
+# whitespace (e.g. 'secret for an RDS instance') there is no telling where a credential ends
+CREDENTIAL_SEPARATORS = frozenset('=:"')
+
+def _mask_credentials(regex: Any, text: str) -> Tuple[Union[str, None], int]:
+    """
+    Replace each general_credentials hit in free text with SANITIZED-CREDENTIAL,
+    keeping the keyword and separator (e.g. 'password=').
+    
+    The captured credential stops at characters outside the pattern's class,
+    so masking runs on to the next whitespace, or to the closing quote for a
+    quoted value; otherwise the rest of a credential such as 'Abc/123(x)' or
+    "correct horse battery" would be left in the text.
+    
+    Args:
+        regex: Compiled general_credentials pattern
+        text: Field value to mask
+        
+    Returns:
+        The masked text and the number of credentials replaced. The text is None
+        when a credential's end can't be found, so the whole field must be replaced.
+    """
+    pieces = []
+    pos = count = 0
+    for match in regex.finditer(text):
+        # A keyword inside a token that was already masked needs nothing more
+        if match.start() < pos:
+            continue
+        start, end = match.span(1) if match.lastindex else match.span()
+        separator = text[match.start():start]
+        if CREDENTIAL_SEPARATORS.isdisjoint(separator):
+            return None, count + 1
+        if separator[-1:] in CREDENTIAL_QUOTES:
+            token_end = text.find(separator[-1], start)
+            if token_end == -1:
+                return None, count + 1
+        else:
+            token_end = TOKEN_END_RE.search(text, end)
+            token_end = token_end.start() if token_end else len(text)
+        pieces.append(text[pos:start])
+        pieces.append("SANITIZED-CREDENTIAL")
+        pos = token_end
+        count += 1
+    if not count:
+        return text, 0
+    pieces.append(text[pos:])
+    return "".join(pieces), count
+
+def _format_path(path_parts: List[Union[str, int]]) -> str:
+    """
+    Build a report path such as 'Resources.MyDB.Properties.Tags[0].Value' from
+    its keys and list indexes. Only called when a path is actually needed.
+    """
+    path = ""
+    for part in path_parts:
+        if isinstance(part, int):
+            path = f"{path}[{part}]"
+        else:
+            path = f"{path}.{part}" if path else part
+    return path
+
+@lru_cache(maxsize=4096)
+def _is_sensitive_name(param_name: str) -> bool:
+    """
+    Determine if a parameter name indicates sensitive content. Memoized, as
+    this is a pure function of the name.
+    """
+    param_lower = param_name.lower()
+    categories = _param_term_categories(param_lower)
+    
+    # If parameter name contains any strong non-sensitive terms, it's likely not sensitive
+    if 'strong_non_sensitive' in categories:
+        return False
+    
+    # If parameter name contains any non-sensitive keywords, check carefully
+    if 'non_sensitive' in categories:
+        # If it contains both sensitive and non-sensitive keywords,
+        # check if any sensitive term appears as a standalone word.
+        # If no standalone sensitive terms, it's probably not sensitive
+        return bool(SENSITIVE_WORD_RE.search(param_lower))
+    
+    # Otherwise just check for any sensitive terms
+    return 'sensitive' in categories
+
+@lru_cache(maxsize=8192)
+def _is_sensitive_string(value: str) -> bool:
+    """
+    Check if a string value is likely to be sensitive. Memoized, since the same
+    values (defaults, tag values, names) recur throughout a template.
+    """
+    # Skip short values and common non-sensitive values
+    if len(value) < 8:
+        return False
+
+    # Skip instance types (which follow specific formats)
+    if INSTANCE_TYPE_RE.match(value) or DB_INSTANCE_TYPE_RE.match(value):
+        return False
+
+    # Check for specific patterns that indicate sensitivity
+    if _match_pattern(value):
+        return True
+
+    # Check for common password patterns
+    if PASSWORD_SPECIAL_CHARS.isdisjoint(value):
+        return False
+    if PASSWORD_HEURISTIC_RE.search(value):
+        return True
+
+    return False
+
 class CloudFormationSanitizer:
     """Class for sanitizing CloudFormation templates."""
     
@@ -48,32 +503,7 @@ class CloudFormationSanitizer:
         Determine if a parameter name indicates sensitive content.
         Returns False for parameters that are explicitly non-sensitive.
         """
-        # First check if parameter contains non-sensitive keywords
-        param_lower = param_name.lower()
-        
-        # Strong non-sensitive indicators that should override sensitivity checks
-        STRONG_NON_SENSITIVE_TERMS = {'bucket', 'domain', 'path', 'url', 'endpoint', 'address', 
-                                      'name', 'file', 'region', 'zone', 'id', 'arn', 'identifier'}
-        
-        # If parameter name contains any strong non-sensitive terms, it's likely not sensitive
-        for term in STRONG_NON_SENSITIVE_TERMS:
-            if term in param_lower:
-                return False
-        
-        # If parameter name contains any non-sensitive keywords, check carefully
-        for keyword in NON_SENSITIVE_PARAM_KEYWORDS:
-            if keyword in param_lower:
-                # If it contains both sensitive and non-sensitive keywords,
-                # check if any sensitive term appears as a standalone word
-                for sensitive_term in SENSITIVE_PARAM_NAMES:
-                    # Check if the sensitive term appears as a whole word
-                    if re.search(r'\b' + sensitive_term + r'\b', param_lower):
-                        return True
-                # If no standalone sensitive terms, it's probably not sensitive
-                return False
-                
-        # Otherwise just check for any sensitive terms
-        return any(sensitive_term in param_lower for sensitive_term in SENSITIVE_PARAM_NAMES)
+        return _is_sensitive_name(param_name)
     
     def _is_sensitive_value(self, value: str) -> bool:
         """
@@ -82,26 +512,7 @@ class CloudFormationSanitizer:
         """
         if not isinstance(value, str):
             return False
-            
-        # Skip short values and common non-sensitive values
-        if len(value) < 8:
-            return False
-            
-        # Skip instance types (which follow specific formats)
-        if re.match(r'^[a-z]+\d+\.(?:micro|small|medium|large|[0-9]?xl|metal)', value) or \
-           re.match(r'^db\.[a-z]+\d+\.(?:micro|small|medium|large|[0-9]?xl|metal)', value):
-            return False
-            
-        # Check for specific patterns that indicate sensitivity
-        for pattern_name, pattern_def in PATTERNS.items():
-            if 'regex' in pattern_def and re.search(pattern_def['regex'], value):
-                return True
-                
-        # Check for common password patterns
-        if re.search(r'[A-Z].*[0-9].*[!@#$%^&*()]|[0-9].*[A-Z].*[!@#$%^&*()]', value):
-            return True
-            
-        return False
+        return _is_sensitive_string(value)
     
     def _pre_scan_parameters(self) -> None:
         """Pre-scan parameters to identify potentially sensitive ones."""
@@ -129,14 +540,15 @@ class CloudFormationSanitizer:
                 if self._is_sensitive_value(default_val):
                     self.sensitive_params.add(param_name)
     
-    def _sanitize_parameter_default(self, param_name: str, default_value: Any, path: str) -> Any:
+    def _sanitize_parameter_default(self, param_name: str, default_value: Any,
+                                    path_parts: List[Union[str, int]]) -> Any:
         """
         Sanitize parameter default values based on parameter name and content.
         
         Args:
             param_name: Name of the parameter
             default_value: The default value to sanitize
-            path: Path to the current node for reporting
+            path_parts: Keys and list indexes leading to the current node
             
         Returns:
             Sanitized default value
@@ -156,24 +568,23 @@ class CloudFormationSanitizer:
                 return default_value
         
         # Try to find a specific pattern that matches this default value
-        for pattern_name, pattern_def in PATTERNS.items():
-            if 'regex' in pattern_def:
-                if re.search(pattern_def['regex'], default_value):
-                    # Use pattern-specific placeholder for detected sensitive data
-                    placeholder = f"SANITIZED-{pattern_name.upper()}-VALUE"
-                    self.report.append({
-                        "path": path,
-                        "pattern": pattern_name,
-                        "original": default_value
-                    })
-                    return placeholder
+        pattern_name = _match_pattern(default_value)
+        if pattern_name:
+            # Use pattern-specific placeholder for detected sensitive data
+            placeholder = VALUE_PLACEHOLDERS[pattern_name]
+            self.report.append({
+                "path": _format_path(path_parts),
+                "pattern": pattern_name,
+                "original": default_value
+            })
+            return placeholder
         
         # If parameter name indicates sensitivity but no specific pattern matched,
         # use generic placeholder based on parameter name
         if param_name in self.sensitive_params:
-            placeholder = f"SANITIZED-PARAMETER-VALUE"
+            placeholder = "SANITIZED-PARAMETER-VALUE"
             self.report.append({
-                "path": path,
+                "path": _format_path(path_parts),
                 "pattern": "parameter_defaults",
                 "original": default_value
             })
@@ -181,15 +592,16 @@ class CloudFormationSanitizer:
             
         return default_value
         
-    def _sanitize_property(self, key: str, value: Any, path: str, section: str) -> Any:
+    def _sanitize_property(self, key: str, value: Any, path_parts: List[Union[str, int]],
+                           section: int) -> Any:
         """
         Sanitize a property value if it contains sensitive information.
         
         Args:
             key: Property key
             value: Property value to sanitize
-            path: Path to the current node for reporting
-            section: Current template section
+            path_parts: Keys and list indexes leading to the current node
+            section: Current template section (a SECTION_* constant)
             
         Returns:
             Sanitized property value
@@ -197,57 +609,55 @@ class CloudFormationSanitizer:
         # Handle different value types
         if isinstance(value, str):
             # Skip sanitizing simple names or identifiers in tags
-            if key == 'Value' and 'Tags' in path:
+            # Look at the parts directly, so the path string is still only built when reported
+            if key == 'Value' and any(isinstance(part, str) and 'Tags' in part for part in path_parts):
                 # Skip simple resource/instance names without special characters
-                if re.match(r'^[A-Za-z0-9-]+$', value) and not self._is_sensitive_value(value):
+                if _is_simple_name(value) and not self._is_sensitive_value(value):
                     return value
                     
-            # Check if this is a key that directly indicates sensitivity
-            for pattern_name, pattern_def in PATTERNS.items():
-                pattern_keys = pattern_def.get('keys', [])
+            # Regex-based matching for content scanning in specific fields
+            for pattern_name, regex in STRING_SCAN_PATTERNS.get(key, ()):
+                # Special case for general credential scanning in descriptions and similar fields
+                if pattern_name == 'general_credentials' and key in CREDENTIAL_TEXT_KEYS:
+                    # For general text fields, just replace the credential portion
+                    sanitized_value, count = _mask_credentials(regex, value)
+                    if count:
+                        self.report.append({
+                            "path": _format_path(path_parts),
+                            "pattern": pattern_name,
+                            "original": value
+                        })
+                        # Without a clear end to the credential, replace the whole field
+                        if sanitized_value is None:
+                            return PLACEHOLDERS[pattern_name][key]
+                        return sanitized_value
+                    continue
                 
-                # Key-based matching
-                if key in pattern_keys:
-                    # For Value fields, only consider sensitive if complex or contains sensitive data
-                    if key == 'Value' and not self._is_sensitive_value(value):
-                        # Skip sanitizing simple names
-                        if re.match(r'^[A-Za-z0-9-]+$', value):
-                            return value
-                            
-                    placeholder = f"{{{{resolve:secretsmanager:{pattern_name}:SecretString:{key}}}}}"
+                if regex.search(value):
+                    placeholder = PLACEHOLDERS[pattern_name][key]
                     self.report.append({
-                        "path": path,
+                        "path": _format_path(path_parts),
                         "pattern": pattern_name,
                         "original": value
                     })
                     return placeholder
-                
-                # Regex-based matching for content scanning in specific fields
-                if 'regex' in pattern_def and key in STRING_SCAN_KEYS:
-                    if re.search(pattern_def['regex'], value):
-                        placeholder = f"{{{{resolve:secretsmanager:{pattern_name}:SecretString:{key}}}}}"
-                        self.report.append({
-                            "path": path,
-                            "pattern": pattern_name,
-                            "original": value
-                        })
-                        return placeholder
+            
+            # Check if this is a key that directly indicates sensitivity
+            pattern_name = KEY_TO_PATTERN.get(key)
+            if pattern_name:
+                # For Value fields, only consider sensitive if complex or contains sensitive data
+                if key == 'Value' and not self._is_sensitive_value(value):
+                    # Skip sanitizing simple names
+                    if _is_simple_name(value):
+                        return value
                         
-                # Special case for general credential scanning in descriptions and similar fields
-                if pattern_name == 'general_credentials' and 'regex' in pattern_def:
-                    if key in {'Description', 'Name'} and re.search(pattern_def['regex'], value):
-                        # For general text fields, just replace the credential portion
-                        sanitized_value = re.sub(
-                            pattern_def['regex'],
-                            r'\g<0>'.replace(r'\1', "SANITIZED-CREDENTIAL"),
-                            value
-                        )
-                        self.report.append({
-                            "path": path,
-                            "pattern": pattern_name,
-                            "original": value
-                        })
-                        return sanitized_value
+                placeholder = PLACEHOLDERS[pattern_name][key]
+                self.report.append({
+                    "path": _format_path(path_parts),
+                    "pattern": pattern_name,
+                    "original": value
+                })
+                return placeholder
         
         # Handle special case: Base64 encoded UserData
         elif isinstance(value, dict):
@@ -255,28 +665,25 @@ class CloudFormationSanitizer:
             if key == 'UserData' and 'Fn::Base64' in value:
                 base64_content = value['Fn::Base64']
                 # Case 1a: Simple string content
-                if isinstance(base64_content, str):
-                    for pattern_name, pattern_def in PATTERNS.items():
-                        pattern_keys = pattern_def.get('keys', [])
-                        if 'UserData' in pattern_keys:
-                            placeholder = f"{{{{resolve:secretsmanager:{pattern_name}:SecretString:{key}}}}}"
-                            result = {'Fn::Base64': placeholder}
-                            self.report.append({
-                                "path": path,
-                                "pattern": pattern_name,
-                                "original": base64_content
-                            })
-                            return result
+                if isinstance(base64_content, str) and USERDATA_PATTERN:
+                    placeholder = PLACEHOLDERS[USERDATA_PATTERN][key]
+                    result = {'Fn::Base64': placeholder}
+                    self.report.append({
+                        "path": _format_path(path_parts),
+                        "pattern": USERDATA_PATTERN,
+                        "original": base64_content
+                    })
+                    return result
                 
                 # Case 1b: UserData with nested intrinsic function like !Sub
                 elif isinstance(base64_content, dict) and 'Fn::Sub' in base64_content:
                     sub_content = base64_content['Fn::Sub']
                     # Replace with sanitized version regardless of content
-                    placeholder = f"{{{{resolve:secretsmanager:generic_secret:SecretString:{key}}}}}"
+                    placeholder = PLACEHOLDERS[FALLBACK_PATTERN][key]
                     result = {'Fn::Base64': placeholder}
                     self.report.append({
-                        "path": path,
-                        "pattern": "generic_secret",
+                        "path": _format_path(path_parts),
+                        "pattern": FALLBACK_PATTERN,
                         "original": str(base64_content)[:100] + "..." if len(str(base64_content)) > 100 else str(base64_content)
                     })
                     return result
@@ -284,30 +691,27 @@ class CloudFormationSanitizer:
             # Case 2: Direct Sub in UserData (without Base64)
             elif key == 'UserData' and 'Fn::Sub' in value:
                 sub_content = value['Fn::Sub']
-                placeholder = f"{{{{resolve:secretsmanager:generic_secret:SecretString:{key}}}}}"
+                placeholder = PLACEHOLDERS[FALLBACK_PATTERN][key]
                 self.report.append({
-                    "path": path,
-                    "pattern": "generic_secret",
+                    "path": _format_path(path_parts),
+                    "pattern": FALLBACK_PATTERN,
                     "original": str(sub_content)[:100] + "..." if len(str(sub_content)) > 100 else str(sub_content)
                 })
                 return {'Fn::Sub': placeholder}
         
         # Handle list of strings (like Passwords)
-        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
-            if key in {'Passwords'}:  # Known list-type sensitive fields
+        elif isinstance(value, list) and key in SENSITIVE_LIST_KEYS:
+            if all(isinstance(item, str) for item in value):
                 sanitized_list = []
+                path = _format_path(path_parts)
                 for idx, item in enumerate(value):
-                    item_pattern_name = None
                     # Try to find a matching pattern
-                    for pattern_name, pattern_def in PATTERNS.items():
-                        if 'regex' in pattern_def and re.search(pattern_def['regex'], item):
-                            item_pattern_name = pattern_name
-                            break
+                    item_pattern_name = _match_pattern(item)
                     
                     if not item_pattern_name:
-                        item_pattern_name = 'generic_secret'
+                        item_pattern_name = FALLBACK_PATTERN
                         
-                    placeholder = f"SANITIZED-{item_pattern_name.upper()}-VALUE-{idx}"
+                    placeholder = f"{VALUE_PLACEHOLDERS[item_pattern_name]}-{idx}"
                     sanitized_list.append(placeholder)
                     self.report.append({
                         "path": f"{path}[{idx}]",
@@ -318,64 +722,94 @@ class CloudFormationSanitizer:
                 
         return value
     
-    def _sanitize_node(self, node: Any, path: str = "", parent: str = "", section: str = "") -> Any:
+    @staticmethod
+    def _push_node(stack: List[Tuple], node: Any, depth: int, parent: str, section: int) -> None:
+        """
+        Push a dict or list node onto the traversal stack, together with an
+        iterator over its entries, the length of its path and the context its
+        entries are visited in.
         """
-        Recursively sanitize a node in the CloudFormation template.
+        if isinstance(node, dict):
+            if depth >= INTRINSIC_MIN_DEPTH and len(node) == 1:
+                name, args = next(iter(node.items()))
+                if name in SKIP_INTRINSICS and _is_scalar_args(args):
+                    return
+            # Iterate the live view: sanitizing only ever reassigns values of existing
+            # keys, which doesn't invalidate the iterator, so no snapshot is needed
+            stack.append((node, iter(node.items()), depth, parent, section))
+        elif isinstance(node, list):
+            stack.append((node, enumerate(node), depth, parent, section))
+    
+    def _sanitize_node(self, node: Any, parent: str = "", section: int = SECTION_OTHER) -> Any:
+        """
+        Sanitize a node in the CloudFormation template and everything below it.
+        
+        The tree is walked depth-first with an explicit stack of iterators instead
+        of recursion, so deeply nested templates don't pay a Python call per node or
+        hit the recursion limit. Entries are visited in the same order as before.
+        The current path is kept as a shared list of keys and list indexes and only
+        turned into a string when it is reported.
         
         Args:
             node: Current node to sanitize
-            path: Path to the current node
             parent: Parent node key/name
-            section: Current section of the template
+            section: Current section of the template (a SECTION_* constant)
             
         Returns:
             Sanitized node
         """
-        # Determine current section if none provided
-        if not section and path:
-            section = path.split('.')[0] if '.' in path else path
-        
-        if isinstance(node, dict):
-            for key, val in list(node.items()):
-                loc = f"{path}.{key}" if path else key
-                
-                # Handle different sections differently
-                if section == 'Parameters':
-                    if key == 'Default' and parent in self.parameter_names:
-                        node[key] = self._sanitize_parameter_default(parent, val, loc)
-                elif section == 'Resources':
-                    sanitized_val = self._sanitize_property(key, val, loc, section)
-                    if sanitized_val is not val:  # Only update if sanitization changed something
-                        node[key] = sanitized_val
-                        continue
-                
-                # Handle special nested structures
-                if key == 'LoginProfile' and isinstance(val, dict):
-                    if 'Password' in val and isinstance(val['Password'], str):
-                        for pattern_name, pattern_def in PATTERNS.items():
-                            pattern_keys = pattern_def.get('keys', [])
-                            if 'Password' in pattern_keys:
-                                placeholder = f"{{{{resolve:secretsmanager:{pattern_name}:SecretString:Password}}}}"
-                                val['Password'] = placeholder
-                                self.report.append({
-                                    "path": f"{loc}.Password",
-                                    "pattern": pattern_name,
-                                    "original": val['Password']
-                                })
-                                break
-                
-                # Recurse into nested structures
-                if isinstance(val, dict):
-                    self._sanitize_node(val, loc, parent=key, section=section)
-                elif isinstance(val, list):
-                    for idx, item in enumerate(val):
-                        if isinstance(item, (dict, list)):
-                            self._sanitize_node(item, f"{loc}[{idx}]", parent=key, section=section)
+        path_parts = []
+        stack = []
+        self._push_node(stack, node, 0, parent, section)
         
-        elif isinstance(node, list):
-            for idx, item in enumerate(node):
+        while stack:
+            current, entries, depth, parent, section = stack[-1]
+            # Drop the key/index left over from the previous entry at this level
+            del path_parts[depth:]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+            
+            if isinstance(current, list):
+                idx, item = entry
                 if isinstance(item, (dict, list)):
-                    self._sanitize_node(item, f"{path}[{idx}]", parent=parent, section=section)
+                    path_parts.append(idx)
+                    self._push_node(stack, item, len(path_parts), parent, section)
+                continue
+            
+            key, val = entry
+            # List indexes are the only int parts, so non-string keys (e.g. YAML ints) go in as text
+            path_parts.append(key if isinstance(key, str) else f"{key}")
+            
+            # Handle different sections differently
+            if section == SECTION_PARAMETERS:
+                if key == 'Default' and parent in self.parameter_names:
+                    current[key] = self._sanitize_parameter_default(parent, val, path_parts)
+            elif section == SECTION_RESOURCES:
+                sanitized_val = self._sanitize_property(key, val, path_parts, section)
+                if sanitized_val is not val:  # Only update if sanitization changed something
+                    current[key] = sanitized_val
+                    continue
+            
+            # Handle special nested structures
+            if key == 'LoginProfile' and isinstance(val, dict):
+                if 'Password' in val and isinstance(val['Password'], str) and LOGIN_PASSWORD_PATTERN:
+                    placeholder = PLACEHOLDERS[LOGIN_PASSWORD_PATTERN]['Password']
+                    val['Password'] = placeholder
+                    self.report.append({
+                        "path": f"{_format_path(path_parts)}.Password",
+                        "pattern": LOGIN_PASSWORD_PATTERN,
+                        "original": val['Password']
+                    })
+            
+            # Descend into nested structures; list items are visited with this key as parent
+            if isinstance(val, dict):
+                # Top-level keys decide the section for everything below them
+                child_section = TEMPLATE_SECTIONS.get(key, SECTION_OTHER) if depth == 0 else section
+                self._push_node(stack, val, len(path_parts), key, child_section)
+            elif isinstance(val, list):
+                self._push_node(stack, val, len(path_parts), key, section)
         
         return node
         
@@ -2,6 +2,12 @@ import json
 import yaml
 from pathlib import Path
 
+# Prefer the libyaml-backed loader, which parses large templates much faster
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Custom tag handlers for CloudFormation intrinsic functions
 def cfn_tag_constructor(loader, tag_suffix, node):
     """
@@ -26,28 +32,34 @@ def sub_constructor(loader, node):
             node.start_mark
         )
 
+class CfnLoader(SafeLoader):
+    """
+    Safe YAML loader with CloudFormation tag handling. Constructors are
+    registered once here instead of on the shared yaml.SafeLoader per load.
+    """
+
+# Register handlers for common CloudFormation tags
+CfnLoader.add_multi_constructor('!', cfn_tag_constructor)
+
+# Special handling for specific tags that aren't prefixed with Fn::
+CfnLoader.add_constructor('!Ref', lambda l, n: {"Ref": l.construct_scalar(n)})
+CfnLoader.add_constructor('!GetAtt', lambda l, n: {"Fn::GetAtt": l.construct_scalar(n).split('.')})
+CfnLoader.add_constructor('!Sub', sub_constructor)
+CfnLoader.add_constructor('!Base64', lambda l, n: {"Fn::Base64": l.construct_scalar(n)})
+
 def load_template(path: str):
     """
     Load a CloudFormation template from a .json, .yaml, or .yml file.
     Returns a tuple: (template_dict, format), where format is 'json' or 'yaml'.
     """
     p = Path(path)
-    content = p.read_text()
+    # Hand the open binary file to the parser rather than decoding it into a str
+    # first; both parsers detect the encoding (UTF-8/UTF-16, BOM) themselves
     if p.suffix.lower() == '.json':
-        return json.loads(content), 'json'
+        with p.open('rb') as f:
+            return json.load(f), 'json'
     elif p.suffix.lower() in ('.yaml', '.yml'):
-        # Create a yaml loader with CloudFormation tag handling
-        loader = yaml.SafeLoader
-        
-        # Register handlers for common CloudFormation tags
-        yaml.add_multi_constructor('!', cfn_tag_constructor, Loader=loader)
-        
-        # Special handling for specific tags that aren't prefixed with Fn::
-        yaml.add_constructor('!Ref', lambda l, n: {"Ref": l.construct_scalar(n)}, Loader=loader)
-        yaml.add_constructor('!GetAtt', lambda l, n: {"Fn::GetAtt": l.construct_scalar(n).split('.')}, Loader=loader)
-        yaml.add_constructor('!Sub', sub_constructor, Loader=loader)
-        yaml.add_constructor('!Base64', lambda l, n: {"Fn::Base64": l.construct_scalar(n)}, Loader=loader)
-        
-        return yaml.load(content, Loader=loader), 'yaml'
+        with p.open('rb') as f:
+            return yaml.load(f, Loader=CfnLoader), 'yaml'
     else:
         raise ValueError("Unsupported extension: use .json, .yaml, or .yml")
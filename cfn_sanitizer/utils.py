@@ -1,9 +1,21 @@
+import io
 import json
-import yaml
-import re
+import math
 from pathlib import Path
 from collections import OrderedDict
 
+# Optional fast JSON encoder (pip install cfn-sanitizer[fast])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Prefer the libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 # Define correct CloudFormation template section order
 CFN_SECTION_ORDER = [
     'AWSTemplateFormatVersion',
@@ -23,115 +35,132 @@ RESOURCE_PROPERTY_ORDER = [
     'Properties'
 ]
 
+# Top-level section keys, which start at column 0 of the dumped YAML
+TOP_LEVEL_SECTIONS = frozenset(CFN_SECTION_ORDER)
+
+# Sections whose entries are separated by a blank line
+SPACED_SECTIONS = frozenset({'Parameters', 'Resources', 'Mappings', 'Outputs'})
+
+# Characters that make str_representer double-quote a string
+YAML_SPECIAL_CHARS = frozenset('{}[]#&*!|>\'"%@`')
+
+# Intrinsic functions whose argument is always written as a tagged scalar
+SCALAR_INTRINSIC_TAGS = {
+    'Ref': '!Ref',
+    'Fn::Sub': '!Sub',
+    'Fn::Base64': '!Base64'
+}
+
 # Custom string representer to handle multiline strings and special characters
 def str_representer(dumper, data):
     style = None
     if '\n' in data:
         style = '|'  # Use literal style for multiline strings
-    elif any(c in data for c in '{}[]#&*!|>\'"%@`'):
+    elif not YAML_SPECIAL_CHARS.isdisjoint(data):
         style = '"'  # Use double quotes for strings with special characters
     return dumper.represent_scalar('tag:yaml.org,2002:str', data, style=style)
 
-# Custom OrderedDict representer
-def represent_ordereddict(dumper, data):
-    return dumper.represent_mapping('tag:yaml.org,2002:map', data.items())
+# Item types a list may hold and still be written in flow style
+SIMPLE_SCALAR_TYPES = frozenset({str, int, float, bool})
 
 # Custom list representer to keep short lists in flow style
 def list_representer(dumper, data):
     # If the list is short and only contains simple types, use flow style
-    if len(data) <= 10 and all(isinstance(item, (str, int, float, bool)) for item in data):
-        return dumper.represent_sequence('tag:yaml.org,2002:seq', data, flow_style=True)
-    return dumper.represent_sequence('tag:yaml.org,2002:seq', data, flow_style=False)
+    flow_style = len(data) <= 10
+    if flow_style:
+        for item in data:
+            if type(item) not in SIMPLE_SCALAR_TYPES:
+                flow_style = False
+                break
+    return dumper.represent_sequence('tag:yaml.org,2002:seq', data, flow_style=flow_style)
 
 # Custom YAML representer for CloudFormation functions
-class CFNDumper(yaml.SafeDumper):
-    pass
+class CFNDumper(SafeDumper):
+    """
+    SafeDumper with the CloudFormation output settings built in.
+    """
+    def __init__(self, stream, **kwargs):
+        kwargs.setdefault('default_flow_style', False)
+        kwargs.setdefault('sort_keys', False)  # Don't sort keys to maintain order
+        kwargs.setdefault('allow_unicode', True)  # Allow Unicode characters
+        kwargs.setdefault('indent', 2)  # Standard indentation
+        kwargs.setdefault('width', 120)  # Wider line width to avoid unnecessary wrapping
+        super().__init__(stream, **kwargs)
 
 def cfn_dict_representer(dumper, data):
     """
     Handle representation of CloudFormation intrinsic functions in YAML.
     """
-    if isinstance(data, dict):
-        # Handle !Ref
-        if len(data) == 1 and 'Ref' in data:
-            return dumper.represent_scalar('!Ref', str(data['Ref']))
-        
-        # Handle !GetAtt
-        if len(data) == 1 and 'Fn::GetAtt' in data:
-            value = data['Fn::GetAtt']
-            if isinstance(value, list):
-                return dumper.represent_scalar('!GetAtt', '.'.join(map(str, value)))
+    # Intrinsic functions are always single-key mappings
+    if len(data) == 1:
+        key, value = next(iter(data.items()))
         
-        # Handle !Sub
-        if len(data) == 1 and 'Fn::Sub' in data:
-            return dumper.represent_scalar('!Sub', str(data['Fn::Sub']))
+        # Handle !Ref, !Sub and !Base64
+        tag = SCALAR_INTRINSIC_TAGS.get(key)
+        if tag:
+            return dumper.represent_scalar(tag, str(value))
         
-        # Handle !Base64
-        if len(data) == 1 and 'Fn::Base64' in data:
-            return dumper.represent_scalar('!Base64', str(data['Fn::Base64']))
+        # Handle !GetAtt
+        if key == 'Fn::GetAtt' and isinstance(value, list):
+            return dumper.represent_scalar('!GetAtt', '.'.join(map(str, value)))
         
         # Handle other intrinsic functions
-        for key, value in data.items():
-            if key.startswith('Fn::'):
-                tag_suffix = key[4:]  # Remove the 'Fn::' prefix
-                # Handle different value types
-                if isinstance(value, str):
-                    return dumper.represent_scalar(f'!{tag_suffix}', str(value))
-                elif isinstance(value, list):
-                    # For sequence nodes like !Join
-                    return dumper.represent_sequence(f'!{tag_suffix}', value, flow_style=True)
+        if isinstance(key, str) and key.startswith('Fn::'):
+            tag = f'!{key[4:]}'  # Remove the 'Fn::' prefix
+            # Handle different value types
+            if isinstance(value, str):
+                return dumper.represent_scalar(tag, value)
+            elif isinstance(value, list):
+                # For sequence nodes like !Join
+                return dumper.represent_sequence(tag, value, flow_style=True)
     
     # Default handling for regular dictionaries
     return dumper.represent_mapping('tag:yaml.org,2002:map', data)
 
-def organize_template(template):
+# Configure the dumper once to handle CloudFormation intrinsic functions and strings.
+# CFNDumper gets its own copy of the table, so the base dumper is left untouched.
+# Nested values can still be OrderedDicts (e.g. JSON loaded with object_pairs_hook),
+# and representers are looked up by exact type, so they get their own entry.
+CFNDumper.yaml_representers = {
+    **SafeDumper.yaml_representers,
+    dict: cfn_dict_representer,
+    OrderedDict: cfn_dict_representer,
+    str: str_representer,
+    list: list_representer
+}
+
+def _py_organize_template(template):
     """
     Reorganize template sections and resource properties in the correct order
     """
-    # Create an ordered dict based on CFN_SECTION_ORDER
-    ordered_template = OrderedDict()
-    
-    # Clean up the Description if present
-    if 'Description' in template:
+    # Clean up the Description if present; most need no changes, so look before rewriting
+    description = template.get('Description')
+    if isinstance(description, str) and ('\u2011' in description or '\\n' in description):
         # Ensure description doesn't have special Unicode characters or explicit newlines
-        description = template['Description']
         description = description.replace('\u2011', '-')  # Replace Unicode hyphens
         description = description.replace('\\n', '\n')    # Replace escaped newlines with actual ones
         template['Description'] = description
     
-    # Add sections in the correct order
-    for section in CFN_SECTION_ORDER:
-        if section in template:
-            if section == 'Resources':
-                # Handle Resources section separately to order resource properties
-                resources = OrderedDict()
-                for res_name, res_content in template[section].items():
-                    ordered_res = OrderedDict()
-                    
-                    # Add Type first, then Properties, then other attributes
-                    for prop in RESOURCE_PROPERTY_ORDER:
-                        if prop in res_content:
-                            ordered_res[prop] = res_content[prop]
-                    
-                    # Add remaining properties
-                    for k, v in res_content.items():
-                        if k not in RESOURCE_PROPERTY_ORDER:
-                            ordered_res[k] = v
-                    
-                    resources[res_name] = ordered_res
-                
-                ordered_template[section] = resources
-            else:
-                ordered_template[section] = template[section]
+    # Sections in CFN_SECTION_ORDER first; unpacking the template afterwards keeps
+    # those positions and appends any other sections in their original order
+    ordered_template = {
+        **{section: template[section] for section in CFN_SECTION_ORDER if section in template},
+        **template
+    }
     
-    # Add any remaining sections that might not be in our predefined order
-    for section, content in template.items():
-        if section not in ordered_template:
-            ordered_template[section] = content
+    # Order each resource as Type, Properties, then the remaining attributes
+    if 'Resources' in ordered_template:
+        ordered_template['Resources'] = {
+            res_name: {
+                **{prop: res_content[prop] for prop in RESOURCE_PROPERTY_ORDER if prop in res_content},
+                **res_content
+            }
+            for res_name, res_content in ordered_template['Resources'].items()
+        }
     
     return ordered_template
 
-def format_yaml_output(yaml_str):
+def _py_format_yaml_output(yaml_str):
     """
     Format CloudFormation YAML with proper spacing and structure.
     
@@ -139,121 +168,144 @@ def format_yaml_output(yaml_str):
     1. Adds blank lines between top-level sections
     2. Adds blank lines between individual parameters and resources
     3. Keeps each parameter/resource block internally compact
-    """
-    # Clean up any existing blank lines
-    lines = [line for line in yaml_str.split('\n') if line.strip() or line == '']
     
-    # Define the top-level sections
-    top_level_sections = [
-        'AWSTemplateFormatVersion:', 
-        'Description:', 
-        'Parameters:', 
-        'Mappings:', 
-        'Conditions:', 
-        'Transform:', 
-        'Resources:', 
-        'Outputs:', 
-        'Metadata:'
-    ]
+    `yaml_str` is either the YAML text or a text stream positioned at its start.
+    """
+    # Iterating a text stream yields its '\n'-terminated lines without splitting a copy
+    lines = io.StringIO(yaml_str) if isinstance(yaml_str, str) else yaml_str
     
-    # Completely rebuild the output line by line with proper formatting
-    output_lines = []
+    # Rebuild the output in a single pass over the lines
+    output = io.StringIO()
     current_section = None
     parameter_count = 0
-    inside_block = False
+    last_line = ''
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Handle top-level sections
-        if any(line.strip().startswith(section) for section in top_level_sections):
-            # Add blank line before top-level sections (except first)
-            if output_lines and output_lines[-1] != '':
-                output_lines.append('')
-                
-            output_lines.append(line)
-            current_section = line.strip().split(':')[0]
-            parameter_count = 0
-            inside_block = False
-            i += 1
+    for line in lines:
+        # Drop existing blank lines; spacing is decided below
+        if not line or line.isspace():
             continue
-            
-        # Handle level 2 items (parameters, resources)
-        if line.strip() and len(line) - len(line.lstrip()) == 2 and ':' in line:
-            if parameter_count > 0 and current_section in ['Parameters', 'Resources', 'Mappings', 'Outputs']:
+        
+        # Handle top-level sections; only unindented lines can be one
+        if not line[0].isspace():
+            section, colon, _ = line.partition(':')
+            if colon and section in TOP_LEVEL_SECTIONS:
+                # Add blank line before top-level sections (except first)
+                if last_line:
+                    output.write('\n')
+                current_section = section
+                parameter_count = 0
+        
+        # Handle level 2 items (parameters, resources); deeper lines are copied as they are.
+        # The first character is whitespace here, so an indent of exactly 2 only needs the next two.
+        elif line[1].isspace() and not line[2].isspace() and ':' in line:
+            if parameter_count > 0 and current_section in SPACED_SECTIONS:
                 # Add blank line between parameters/resources
-                if output_lines[-1] != '':
-                    output_lines.append('')
-            
+                output.write('\n')
             parameter_count += 1
-            inside_block = True
-            output_lines.append(line)
-            
-            # Process the parameter block properties
-            j = i + 1
-            while j < len(lines) and (not lines[j].strip() or len(lines[j]) - len(lines[j].lstrip()) > 2):
-                if lines[j].strip():  # Only add non-empty lines
-                    output_lines.append(lines[j])
-                j += 1
-                
-            i = j
-            continue
-            
-        # Add any other lines
-        if line.strip():
-            output_lines.append(line)
-            
-        i += 1
-    
-    # Join lines and ensure there's a trailing newline
-    result = '\n'.join(output_lines)
-    if not result.endswith('\n'):
-        result += '\n'
         
-    return result
+        output.write(line)
+        last_line = line
+    
+    # Every dumped line already ends in '\n'; only the last line of a plain string
+    # (or an empty document) can be missing it
+    if not last_line.endswith('\n'):
+        output.write('\n')
+    return output.getvalue()
+
+# Use the compiled versions of the two functions above when the optional extension was
+# built; the pure-Python ones stay available under their _py_ names
+try:
+    from cfn_sanitizer import _fastfmt
+except ImportError:
+    organize_template = _py_organize_template
+    format_yaml_output = _py_format_yaml_output
+else:
+    organize_template = _fastfmt.organize_template
+    format_yaml_output = _fastfmt.format_yaml_output
+
+def ensure_parent_dir(p: Path):
+    """
+    Create the parent directory of p if it doesn't exist.
+    
+    Not cached: the directory can be removed, or a relative path resolve
+    elsewhere after a chdir, between saves, and one mkdir per file is cheap
+    next to the write.
+    """
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+def _has_non_finite_float(data) -> bool:
+    """
+    Check if data holds a NaN or infinite float anywhere, as a value or a key.
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, float):
+            if not math.isfinite(node):
+                return True
+        elif isinstance(node, dict):
+            stack.extend(node)
+            stack.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+    return False
+
+def write_json(p: Path, data):
+    """
+    Write data as indented JSON, with orjson when it is installed.
+    """
+    # orjson writes NaN and Infinity as null, so only the json module keeps those values
+    if orjson is not None and not _has_non_finite_float(data):
+        try:
+            p.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits; the json module handles these
+    p.write_text(json.dumps(data, indent=2))
+
+def dump_yaml(data, stream):
+    """
+    Serialize data into a text stream as a single YAML document using CFNDumper.
+    """
+    dumper = CFNDumper(stream)
+    try:
+        dumper.open()
+        dumper.represent(data)
+        dumper.close()
+    finally:
+        dumper.dispose()
 
-def save_template(path: str, template: dict, fmt: str):
+def save_template(path: str, template: dict, fmt: str, pretty: bool = True):
     """
     Write the sanitized template back to a file, preserving JSON or YAML.
+    
+    With pretty=False the YAML is written as dumped, without the blank lines
+    format_yaml_output adds between sections and entries.
     """
     p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(p)
     if fmt == 'json':
-        p.write_text(json.dumps(template, indent=2))
+        write_json(p, template)
     else:
         # Organize template sections and properties
         organized_template = organize_template(template)
         
-        # Configure the dumper to handle CloudFormation intrinsic functions and strings
-        CFNDumper.add_representer(dict, cfn_dict_representer)
-        CFNDumper.add_representer(OrderedDict, represent_ordereddict)
-        CFNDumper.add_representer(str, str_representer)
-        CFNDumper.add_representer(list, list_representer)
-        
-        # Disable the default string representer
-        yaml.add_representer(str, str_representer, Dumper=CFNDumper)
-        
-        # Configure YAML dumping
-        yaml_output = yaml.dump(
-            organized_template, 
-            default_flow_style=False,
-            sort_keys=False,  # Don't sort keys to maintain order
-            allow_unicode=True,  # Allow Unicode characters
-            indent=2,  # Standard indentation
-            width=120,  # Wider line width to avoid unnecessary wrapping
-            Dumper=CFNDumper
-        )
+        # Dump into a buffer the formatter can read line by line
+        buffer = io.StringIO()
+        dump_yaml(organized_template, buffer)
         
-        # Post-process to add blank lines for better readability
-        yaml_output = format_yaml_output(yaml_output)
-        
-        p.write_text(yaml_output)
+        if pretty:
+            buffer.seek(0)
+            
+            # Post-process to add blank lines for better readability
+            p.write_text(format_yaml_output(buffer))
+        else:
+            p.write_text(buffer.getvalue())
 
 def save_report(path: str, report: list):
     """
     Serialize the report of replaced secrets as JSON.
     """
     p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(report, indent=2))
+    ensure_parent_dir(p)
+    write_json(p, report)
@@ -1,15 +1,60 @@
-from setuptools import setup, find_packages
+import json
+from pathlib import Path
+
+import yaml
+from setuptools import setup, find_packages, Extension
+from setuptools.command.build_py import build_py
+
+# The compiled formatter is optional; without Cython the pure-Python code in utils.py is used
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
+PACKAGE_DIR = Path(__file__).parent / "cfn_sanitizer"
+
+
+class BuildPyWithPatterns(build_py):
+    """Regenerate patterns.json from patterns.yaml before building the package."""
+
+    def run(self):
+        with open(PACKAGE_DIR / "patterns.yaml", encoding="utf-8") as f:
+            patterns = yaml.safe_load(f)
+        with open(PACKAGE_DIR / "patterns.json", "w", encoding="utf-8") as f:
+            json.dump(patterns, f, indent=2)
+            f.write("\n")
+        super().run()
+
+
+def fast_extensions():
+    """Cython build of the YAML output helpers, skipped if Cython or a compiler is missing."""
+    if cythonize is None:
+        return []
+    extension = Extension("cfn_sanitizer._fastfmt", ["cfn_sanitizer/_fastfmt.pyx"], optional=True)
+    return cythonize([extension], language_level=3)
+
 
 setup(
     name="cfn-sanitizer",
     version="0.1.0",
     packages=find_packages(),
     include_package_data=True,
-    package_data={"cfn_sanitizer": ["patterns.yaml"]},
+    package_data={"cfn_sanitizer": ["patterns.yaml", "patterns.json"]},
+    cmdclass={"build_py": BuildPyWithPatterns},
+    ext_modules=fast_extensions(),
     install_requires=[
         "PyYAML>=5.4",
         "click>=8.0"
     ],
+    extras_require={
+        # Optional accelerators, picked up automatically when installed
+        "fast": [
+            "google-re2",
+            "hyperscan",
+            "pyahocorasick",
+            "orjson",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "sanitize-cfn=cfn_sanitizer.cli:main",
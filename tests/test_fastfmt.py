@@ -0,0 +1,95 @@
+"""
+Parity check between the compiled helpers in _fastfmt.pyx and the pure-Python
+versions in utils.py. Skipped when the extension isn't built.
+
+Run with: python -m unittest discover tests
+"""
+import copy
+import io
+import unittest
+from pathlib import Path
+
+from cfn_sanitizer import utils
+from cfn_sanitizer.scanner import load_template
+
+try:
+    from cfn_sanitizer import _fastfmt
+except ImportError:
+    _fastfmt = None
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "Templates-Tested"
+
+# Hand-written YAML covering the formatter's edge cases: blank and whitespace-only
+# lines, section-like keys that aren't sections, indents around 2 and a missing
+# trailing newline
+FORMAT_CASES = [
+    "",
+    "\n",
+    "Description: x",
+    "AWSTemplateFormatVersion: '2010-09-09'\n\n\nDescription: x\n",
+    "Parameters:\n  A:\n    Type: String\n  B:\n    Type: String\n",
+    "Resources:\n  R1:\n    Type: X\n  R2:\n    Type: Y\nOutputs:\n  O:\n    Value: 1",
+    "Mappings:\n  M:\n    a: 1\n  N:\n    b: 2\n",
+    "DescriptionX: y\nResources:\n   R: 1\n  S: 2\n \t\n  T: 3\n",
+    "Resources:\n  - item\n  key: v\n  plain\n  \u3000x: y\n",
+    "Transform: AWS::Serverless-2016-10-31\nConditions:\n  C: true\n  D: false\n",
+]
+
+# Templates covering organize_template's section/property ordering and Description cleanup
+ORGANIZE_CASES = [
+    {},
+    {"Description": "a\\nb \u2011 c", "Resources": {}},
+    {"Outputs": {}, "X": 1, "Resources": {"R": {"DependsOn": "S", "Properties": {}, "Type": "T"}},
+     "AWSTemplateFormatVersion": "2010-09-09", "Parameters": {}},
+    {"Resources": {"R": {"Metadata": {}, "Condition": "C"}}, "Description": 5},
+]
+
+
+def ordered_items(node):
+    """Nested (key, value) lists, so dict comparisons also check key order."""
+    if isinstance(node, dict):
+        return [(key, ordered_items(value)) for key, value in node.items()]
+    if isinstance(node, list):
+        return [ordered_items(item) for item in node]
+    return node
+
+
+def dumped_templates():
+    """YAML dumps of the sample templates, as save_template produces them."""
+    for path in sorted(TEMPLATES_DIR.iterdir()):
+        template, _ = load_template(str(path))
+        buffer = io.StringIO()
+        utils.dump_yaml(utils._py_organize_template(template), buffer)
+        yield path.name, buffer.getvalue()
+
+
+@unittest.skipIf(_fastfmt is None, "cfn_sanitizer._fastfmt is not built")
+class FastfmtParityTest(unittest.TestCase):
+
+    def test_utils_uses_compiled_helpers(self):
+        self.assertIs(utils.organize_template, _fastfmt.organize_template)
+        self.assertIs(utils.format_yaml_output, _fastfmt.format_yaml_output)
+
+    def test_format_yaml_output(self):
+        cases = [(f"case {idx}", text) for idx, text in enumerate(FORMAT_CASES)]
+        cases.extend(dumped_templates())
+        for name, text in cases:
+            with self.subTest(name):
+                expected = utils._py_format_yaml_output(text)
+                self.assertEqual(_fastfmt.format_yaml_output(text), expected)
+                self.assertEqual(_fastfmt.format_yaml_output(io.StringIO(text)), expected)
+
+    def test_organize_template(self):
+        cases = [(f"case {idx}", template) for idx, template in enumerate(ORGANIZE_CASES)]
+        cases.extend(
+            (path.name, load_template(str(path))[0]) for path in sorted(TEMPLATES_DIR.iterdir())
+        )
+        for name, template in cases:
+            with self.subTest(name):
+                expected = utils._py_organize_template(copy.deepcopy(template))
+                actual = _fastfmt.organize_template(copy.deepcopy(template))
+                self.assertEqual(ordered_items(actual), ordered_items(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()